@@ -0,0 +1,120 @@
+#  BENCHMARK: ANALÍTICA VECTORIZADA DE pg_stat_statements (workload_analytics / n_plus_one_suspicions)
+#  uso:
+#    python bench/bench_analytics.py                  (50000 sentencias sintéticas)
+#    python bench/bench_analytics.py --rows 200000
+#    python bench/bench_analytics.py --memory           (pico de memoria: stream vs lista)
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import server  # noqa: E402
+
+
+# filas con la misma forma que devuelve _PGSS_FRAME_SQL (generador, como el cursor)
+def synthetic_rows(n: int):
+    rnd = random.Random(21)
+    for i in range(n):
+        calls = int(rnd.paretovariate(1.2) * 10)
+        per_call = rnd.choice((1, 1, 1, 2, 10, 50)) if rnd.random() > 0.002 else 10**5
+        hit = rnd.randint(0, 10**6)
+        yield (
+            rnd.getrandbits(63),
+            calls,
+            calls * per_call,
+            calls * rnd.random() * 5,
+            rnd.random() * 5,
+            hit,
+            rnd.randint(0, hit // 10 + 1),
+            rnd.choice((0, 0, 0, rnd.randint(0, 5000))),
+            rnd.choice((0, 0, 0, rnd.randint(0, 5000))),
+            rnd.randint(0, 10**7),
+        )
+
+
+# texto de una sentencia (en el servidor solo se pide para las devueltas)
+def synthetic_text(queryid: int) -> str:
+    return f"select * from t{queryid % 300} where id = {queryid} and status in (1, 2)"
+
+
+# pico de memoria (tracemalloc) del frame armado desde el stream vs desde una lista
+def memory(n: int):
+    tracemalloc.start()
+    server._pgss_frame_from_rows(synthetic_rows(n))
+    _, stream_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    server._pgss_frame_from_rows(list(synthetic_rows(n)))
+    _, list_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"pico frame n={n}: stream {stream_peak / 2**20:.1f} MiB, "
+        f"lista {list_peak / 2**20:.1f} MiB"
+    )
+
+
+# el filtro anterior de n_plus_one_suspicions (bucle por fila, dicts)
+def loop_filter(rows, max_avg_rows=3.0, min_mean_ms=0.5):
+    out = []
+    for r in rows:
+        calls = r[1]
+        avg_rows = r[2] / calls if calls else 0.0
+        if avg_rows <= max_avg_rows and r[4] >= min_mean_ms:
+            out.append({"calls": calls, "avg_rows": avg_rows, "mean_ms": r[4]})
+    out.sort(key=lambda x: (x["calls"], x["mean_ms"]), reverse=True)
+    return out[:50]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de analítica vectorizada")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--memory", action="store_true")
+    args = parser.parse_args()
+
+    # calienta los imports diferidos (pandas / numpy) fuera de la medición
+    server._score_pgss_frame(server._pgss_frame_from_rows(synthetic_rows(10)), 3.0, 0.5)
+    if args.memory:
+        for n in (args.rows // 10, args.rows, args.rows * 4):
+            memory(n)
+        return
+
+    rows = list(synthetic_rows(args.rows))
+
+    t0 = time.perf_counter()
+    df = server._pgss_frame_from_rows(rows)
+    t_frame = time.perf_counter()
+    df = server._score_pgss_frame(df, 3.0, 0.5)
+    t_score = time.perf_counter()
+    sections = server._analytics_sections(df, args.top, server.ANALYTICS_Z_THRESHOLD)
+    t_sections = time.perf_counter()
+    texts = {
+        int(q): synthetic_text(int(q)) for v in sections.values() for q in v["queryid"]
+    }
+    records = {
+        k: server._frame_records(v, ("calls",), texts) for k, v in sections.items()
+    }
+    t_records = time.perf_counter()
+
+    loop_filter(rows)
+    t_loop = time.perf_counter()
+
+    print(f"sentencias: {len(df)}")
+    print(f"frame        {(t_frame - t0) * 1000:8.1f} ms")
+    print(f"puntajes     {(t_score - t_frame) * 1000:8.1f} ms")
+    print(f"secciones    {(t_sections - t_score) * 1000:8.1f} ms")
+    print(
+        f"registros    {(t_records - t_sections) * 1000:8.1f} ms (normaliza solo el top)"
+    )
+    print(f"total        {(t_records - t0) * 1000:8.1f} ms")
+    print(
+        f"bucle python {(t_loop - t_records) * 1000:8.1f} ms (solo el filtro N+1 anterior)"
+    )
+    print(", ".join(f"{k}={len(v)}" for k, v in records.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#  BENCHMARK: FAMILIAS DE PLANTILLAS (canonicalización + MinHash/LSH) SOBRE VARIANTES DE ORM
+#  cada patrón genera variantes con listas IN, alias, orden de columnas y cláusulas opcionales
+#  uso:
+#    python bench/bench_clusters.py                     (100000 plantillas de 500 patrones)
+#    python bench/bench_clusters.py --templates 20000 --patterns 200 --threshold 0.7
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import server  # noqa: E402
+
+ALIASES = ("t0", "u0", "x", "tbl", "a1")
+
+
+# variantes de un mismo patrón de ORM: largo de la lista IN, alias, orden de columnas,
+# alias de columna, comillas, "deleted_at is null" y LIMIT; cada una con su queryid
+def orm_variant(pattern: int, rnd: random.Random) -> str:
+    table = f"table_{pattern}"
+    cols = [f"col_{pattern}_{j}" for j in range(pattern % 6 + 2)]
+    rnd.shuffle(cols)
+    alias = rnd.choice(ALIASES)
+    quote = '"' if rnd.random() < 0.5 else ""
+    select = ", ".join(
+        f"{alias}.{quote}{c}{quote}"
+        + (f" AS {alias}_{c}" if rnd.random() < 0.3 else "")
+        for c in cols
+    )
+    params = ", ".join(f"${i + 1}" for i in range(rnd.randint(1, 60)))
+    tail = f" AND {alias}.kind_{pattern % 7} = $61" if pattern % 3 == 0 else ""
+    # cláusulas opcionales: la forma canónica cambia, la familia no
+    if rnd.random() < 0.4:
+        tail += f" AND {alias}.deleted_at IS NULL"
+    limit = " LIMIT $62" if rnd.random() < 0.3 else ""
+    return (
+        f"SELECT {select} FROM {quote}public{quote}.{quote}{table}{quote} {alias} "
+        f"WHERE {alias}.id IN ({params}){tail} ORDER BY {alias}.id{limit}"
+    )
+
+
+def synthetic_rows(n: int, patterns: int):
+    rnd = random.Random(25)
+    for i in range(n):
+        calls = int(rnd.paretovariate(1.3) * 10)
+        yield (
+            rnd.getrandbits(63),
+            orm_variant(i % patterns, rnd),
+            calls,
+            calls * rnd.random() * 3,
+            calls * rnd.randint(1, 20),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de familias de plantillas")
+    parser.add_argument("--templates", type=int, default=100000)
+    parser.add_argument("--patterns", type=int, default=500)
+    parser.add_argument("--threshold", type=float, default=server.CLUSTER_THRESHOLD)
+    args = parser.parse_args()
+
+    rows = list(synthetic_rows(args.templates, args.patterns))
+    # calienta numpy y el set de keywords fuera de la medición
+    server._lsh_labels(
+        server._minhash_signatures(server._template_corpus(rows[:10])), 0.8
+    )
+
+    t0 = time.perf_counter()
+    corpus = server._template_corpus(rows)
+    t_corpus = time.perf_counter()
+    sig = server._minhash_signatures(corpus)
+    t_sig = time.perf_counter()
+    labels, bands, per_band = server._lsh_labels(sig, args.threshold)
+    t_lsh = time.perf_counter()
+    families = server._family_report(corpus, labels, 10, True)
+    t_report = time.perf_counter()
+    # segunda llamada: formas canónicas desde CANONICAL_CACHE
+    server._template_corpus(rows)
+    t_warm = time.perf_counter()
+
+    normalized = len({server.normalize_sql(r[1], r[0]) for r in rows})
+    print(f"plantillas: {len(corpus)}  patrones reales: {args.patterns}")
+    print(f"formas normalizadas (normalize_sql): {normalized}")
+    print(f"formas canónicas: {len(corpus.texts)}")
+    print(f"familias (LSH {bands}x{per_band}): {len(set(labels.tolist()))}")
+    print(f"canonicalización {(t_corpus - t0) * 1000:8.1f} ms")
+    print(f"  con cache      {(t_warm - t_report) * 1000:8.1f} ms (segunda llamada)")
+    print(f"firmas MinHash   {(t_sig - t_corpus) * 1000:8.1f} ms")
+    print(f"LSH + familias   {(t_lsh - t_sig) * 1000:8.1f} ms")
+    print(f"reporte          {(t_report - t_lsh) * 1000:8.1f} ms")
+    top = families[0]
+    print(
+        f"familia 1: {top['templates']} queryids, {top['variants']} formas, "
+        f"{top['share_pct']}% del tiempo"
+    )
+
+
+if __name__ == "__main__":
+    main()
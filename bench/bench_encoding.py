@@ -0,0 +1,157 @@
+#  BENCHMARK: CODIFICACIÓN DE RESPUESTAS DEL SHIM (json / orjson / msgspec / msgpack + gzip / zstd)
+#  uso:
+#    python bench/bench_encoding.py                         (plan sintético de 5000 nodos + 1000 slow_queries)
+#    python bench/bench_encoding.py --nodes 20000 --rows 5000
+#    python bench/bench_encoding.py --file plan.json        (salida de EXPLAIN (FORMAT JSON))
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import server  # noqa: E402
+
+NODE_TYPES = ["Hash Join", "Nested Loop", "Seq Scan", "Index Scan", "Sort", "Hash"]
+
+
+def synthetic_plan(n: int):
+    rnd = random.Random(42)
+
+    def node(i):
+        return {
+            "Node Type": rnd.choice(NODE_TYPES),
+            "Relation Name": f"t{i % 50}",
+            "Startup Cost": round(rnd.random() * 100, 2),
+            "Total Cost": round(rnd.random() * 10000, 2),
+            "Plan Rows": rnd.randint(1, 10**6),
+            "Plan Width": rnd.randint(4, 200),
+            "Actual Rows": rnd.randint(0, 10**6),
+            "Actual Total Time": round(rnd.random() * 500, 3),
+            "Actual Loops": rnd.randint(1, 10),
+            "Shared Hit Blocks": rnd.randint(0, 10**5),
+            "Shared Read Blocks": rnd.randint(0, 10**4),
+            "Output": [f"t{i % 50}.c{k}" for k in range(4)],
+        }
+
+    nodes = [node(i) for i in range(n)]
+    for i in range(1, n):
+        nodes[(i - 1) // 2].setdefault("Plans", []).append(nodes[i])
+    return [{"Plan": nodes[0], "Planning Time": 1.2, "Execution Time": 512.3}]
+
+
+def slow_queries_rows(n: int):
+    rnd = random.Random(7)
+    return [
+        {
+            "queryid": str(rnd.getrandbits(63)),
+            "calls": rnd.randint(1, 10**6),
+            "rows": rnd.randint(0, 10**7),
+            "total_ms": rnd.random() * 10**6,
+            "mean_ms": rnd.random() * 100,
+            "normalized": "select o.id, o.created_at from orders o where o.user_id = ? "
+            "and o.status in (?, ?) order by o.created_at desc limit ?",
+        }
+        for _ in range(n)
+    ]
+
+
+def encoders():
+    # json con el mismo formato compacto que usa el shim
+    out = [
+        (
+            "json",
+            lambda o: json.dumps(o, ensure_ascii=False, separators=(",", ":")).encode(
+                "utf-8"
+            ),
+        )
+    ]
+    try:
+        import orjson
+
+        out.append(("orjson", lambda o: orjson.dumps(o, default=str)))
+    except ImportError:
+        pass
+    try:
+        import msgspec
+
+        out.append(("msgspec", lambda o: msgspec.json.encode(o, enc_hook=str)))
+        out.append(("msgpack", lambda o: msgspec.msgpack.encode(o, enc_hook=str)))
+    except ImportError:
+        pass
+    return out
+
+
+def compressors():
+    out = [(f"gzip-{lvl}", lambda b, lvl=lvl: gzip.compress(b, lvl)) for lvl in (1, 5)]
+    zstd = server._zstd_compress()
+    if zstd is not None:
+        out.append((f"zstd-{server.RPC_ZSTD_LEVEL}", zstd))
+    return out
+
+
+def bench(fn, arg, repeat):
+    fn(arg)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(arg)
+    dt = (time.perf_counter() - t0) / repeat
+    return out, dt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de codificación del shim")
+    parser.add_argument("--file", default=None)
+    parser.add_argument("--nodes", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as fh:
+            plan_json = json.load(fh)
+        if isinstance(plan_json, dict):
+            plan_json = [plan_json]
+    else:
+        plan_json = synthetic_plan(args.nodes)
+    nodes = server._flatten_plan(plan_json[0]["Plan"])
+    report, _ = server._plan_report(plan_json, nodes, True, "full", 10)
+    report["nodes"] = nodes.table()
+    payloads = {
+        f"explain full ({len(nodes)} nodos)": {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": report,
+        },
+        f"slow_queries ({args.rows} filas)": {
+            "jsonrpc": "2.0",
+            "id": 2,
+            "result": {"top": slow_queries_rows(args.rows)},
+        },
+    }
+
+    for name, payload in payloads.items():
+        print(f"\n== {name}")
+        base = None
+        for label, fn in encoders():
+            body, dt = bench(fn, payload, args.repeat)
+            base = base or dt
+            print(
+                f"{label:<10} {dt * 1000:8.2f} ms  {len(body) / dt / 1e6:8.1f} MB/s  "
+                f"{len(body) / 1024:9.1f} KiB  x{base / dt:.1f}"
+            )
+        raw = server._json_dumps(payload)
+        for label, fn in compressors():
+            body, dt = bench(fn, raw, max(1, args.repeat // 4))
+            print(
+                f"{label:<10} {dt * 1000:8.2f} ms  {len(raw) / dt / 1e6:8.1f} MB/s  "
+                f"{len(body) / 1024:9.1f} KiB  ratio {len(raw) / len(body):.1f}"
+            )
+    print(f"\nencoder activo (RPC_JSON_ENCODER): {server._json_codec()[0]}")
+
+
+if __name__ == "__main__":
+    main()
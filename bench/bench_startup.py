@@ -0,0 +1,100 @@
+#  BENCHMARK: ARRANQUE DEL SERVIDOR (python -X importtime + tiempo hasta la primera respuesta por stdio)
+#  uso:
+#    python bench/bench_startup.py                 (5 arranques, top 15 imports)
+#    python bench/bench_startup.py -n 10 --top 25
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SERVER = os.path.join(ROOT, "server.py")
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "bench", "version": "0"},
+    },
+}
+
+
+# módulos más caros (acumulado, µs) según -X importtime al importar server
+def importtime(top: int):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        try:
+            self_us, cum_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((cum_us, self_us, depth, name.strip()))
+    total = next((r for r in rows if r[3] == "server"), None)
+    # solo los imports directos de server (profundidad 1) y server mismo
+    direct = sorted((r for r in rows if r[2] <= 1), reverse=True)[:top]
+    return total, direct
+
+
+# segundos desde el spawn hasta la respuesta de initialize por stdio
+def time_to_first_response() -> float:
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, SERVER, "--stdio"],
+        cwd=ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        proc.stdin.write(json.dumps(INITIALIZE) + "\n")
+        proc.stdin.flush()
+        line = proc.stdout.readline()
+        elapsed = time.perf_counter() - t0
+        if '"id":1' not in line.replace(" ", ""):
+            raise RuntimeError(f"respuesta inesperada: {line[:200]!r}")
+        return elapsed
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque")
+    parser.add_argument("-n", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    total, direct = importtime(args.top)
+    if total:
+        print(f"import server: {total[0] / 1000:.1f} ms (propio {total[1] / 1000:.1f} ms)")
+    for cum_us, self_us, depth, name in direct:
+        if name != "server":
+            print(f"  {name:<32} {cum_us / 1000:8.1f} ms")
+
+    samples = [time_to_first_response() for _ in range(args.n)]
+    print(
+        f"stdio initialize: n={len(samples)} p50={statistics.median(samples) * 1000:.0f}ms "
+        f"min={min(samples) * 1000:.0f}ms max={max(samples) * 1000:.0f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#  BENCHMARK: MEMORIA DEL REGISTRO DE PLANTILLAS (dict por fila vs registro con slots en arrays)
+#  uso:
+#    python bench/bench_templates.py                  (50000 plantillas, 300 formas distintas)
+#    python bench/bench_templates.py --templates 100000 --shapes 1000
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import server  # noqa: E402
+
+
+# filas como las de pg_stat_statements: muchos queryid comparten la misma forma
+# (mismas sentencias en varias bases / usuarios, listas IN de distinto largo)
+def synthetic_rows(n: int, shapes: int):
+    rnd = random.Random(24)
+    for i in range(n):
+        shape = i % shapes
+        cols = ", ".join(f"c{j}" for j in range(shape % 12 + 3))
+        calls = rnd.randint(1, 10**5)
+        yield {
+            "queryid": rnd.getrandbits(63),
+            "query": f"select {cols} from t{shape} where id = $1 and status = 'x'"
+            f" and created_at > now() - interval '{shape % 7} days'",
+            "calls": calls,
+            "total_ms": calls * rnd.random(),
+            "rows": calls * rnd.randint(1, 5),
+        }
+
+
+# antes: cache queryid -> (largo, normalizado) y un dict con texto por resultado
+def legacy(rows):
+    cache, results = {}, []
+    for r in rows:
+        normalized = server._normalize_sql_fast(r["query"])
+        cache[r["queryid"]] = (len(r["query"]), normalized)
+        results.append(
+            {
+                "queryid": str(r["queryid"]),
+                "calls": int(r["calls"]),
+                "rows": int(r["rows"]),
+                "total_ms": float(r["total_ms"]),
+                "normalized": normalized[:500],
+            }
+        )
+    return cache, results
+
+
+# ahora: registro (texto una vez, contadores en arrays) y resultados solo con queryid
+def registry(rows):
+    reg, results = server._TemplateRegistry(len(rows)), []
+    for r in rows:
+        reg.intern("", r["queryid"], r["query"])
+        reg.observe("", r["queryid"], r["calls"], r["total_ms"], r["rows"])
+        results.append(
+            {
+                "queryid": str(r["queryid"]),
+                "calls": int(r["calls"]),
+                "rows": int(r["rows"]),
+                "total_ms": float(r["total_ms"]),
+            }
+        )
+    return reg, results
+
+
+# memoria que queda viva en la cache / registro, bytes JSON de la respuesta y tiempo
+def measure(fn, rows):
+    t0 = time.perf_counter()
+    fn(rows)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    store, results = fn(rows)
+    del results
+    store_mib = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    response_mib = len(json.dumps(fn(rows)[1])) / 2**20
+    return store_mib, response_mib, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del registro de plantillas")
+    parser.add_argument("--templates", type=int, default=50000)
+    parser.add_argument("--shapes", type=int, default=300)
+    args = parser.parse_args()
+
+    rows = list(synthetic_rows(args.templates, args.shapes))
+    for name, fn in (("dict por fila", legacy), ("registro", registry)):
+        store_mib, response_mib, elapsed = measure(fn, rows)
+        print(
+            f"{name:<14} retenido {store_mib:6.1f} MiB  "
+            f"respuesta JSON {response_mib:6.1f} MiB  {elapsed * 1000:8.1f} ms"
+        )
+    print(f"plantillas: {len(rows)}, formas distintas: {args.shapes}")
+
+
+if __name__ == "__main__":
+    main()
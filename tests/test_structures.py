@@ -0,0 +1,175 @@
+# PRUEBAS DE LAS ESTRUCTURAS EN MEMORIA (sin base de datos)
+# uso:
+#   python -m pytest -q tests
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+# fila de pg_stat_statements como la lee el sampler: (userid, dbid, queryid, calls, ...)
+def _pgss_row(queryid: int, calls: float) -> tuple:
+    return (1, 1, queryid, calls) + (float(calls),) * (len(server.PGSS_METRICS) - 1)
+
+
+# ring con lugar para 2 claves y 3 deltas retenidos (60 s / 30 s + 1)
+@pytest.fixture
+def ring():
+    return server._PgssRing(retention_s=60, interval_s=30, max_keys=2)
+
+
+def test_ring_drops_new_keys_when_full(ring):
+    ring.add_sample([_pgss_row(1, 10), _pgss_row(2, 10)], 0)
+    ring.add_sample([_pgss_row(1, 20), _pgss_row(2, 20), _pgss_row(3, 5)], 30)
+    assert ring.dropped_keys == 1
+    assert (1, 1, 3) not in ring.slot_of
+
+
+def test_ring_reclaims_evicted_key_slot(ring):
+    ring.add_sample([_pgss_row(1, 10), _pgss_row(2, 10)], 0)
+    ring.add_sample([_pgss_row(1, 20), _pgss_row(2, 10)], 30)
+    # el queryid 2 salió de pg_stat_statements y ningún delta lo usa: se libera
+    ring.add_sample([_pgss_row(1, 30)], 60)
+    assert (1, 1, 2) not in ring.slot_of
+    assert ring.free == [1]
+    assert ring.reclaimed_keys == 1
+    # el slot liberado lo toma la siguiente clave nueva en vez de descartarla
+    ring.add_sample([_pgss_row(1, 40), _pgss_row(3, 5)], 90)
+    assert ring.slot_of[(1, 1, 3)] == 1
+    assert ring.free == []
+    assert ring.dropped_keys == 0
+
+
+def test_ring_keeps_key_while_a_delta_uses_it(ring):
+    ring.add_sample([_pgss_row(1, 10), _pgss_row(2, 10)], 0)
+    ring.add_sample([_pgss_row(1, 20), _pgss_row(2, 10)], 30)
+    ring.add_sample([_pgss_row(2, 10)], 60)
+    # el delta de t=30 todavía referencia al queryid 1
+    assert (1, 1, 1) in ring.slot_of
+    assert ring.window(1000, now=60)["totals"][0][0] == 10.0
+    for t in (90, 120, 150):
+        ring.add_sample([_pgss_row(2, 10)], t)
+    assert (1, 1, 1) not in ring.slot_of
+    assert ring.keys[0] is None
+
+
+def test_ring_clears_on_stats_reset(ring):
+    ring.add_sample([_pgss_row(1, 10)], 0, stats_reset="2026-01-01")
+    ring.add_sample([_pgss_row(1, 20)], 30, stats_reset="2026-01-01")
+    assert ring.resets == 0
+    assert len(ring.deltas) == 1
+    delta = ring.add_sample([_pgss_row(2, 3)], 60, stats_reset="2026-02-01")
+    assert ring.resets == 1
+    assert list(ring.slot_of) == [(1, 1, 2)]
+    # lo acumulado desde el reset cuenta como delta de esta muestra
+    assert list(delta.values[0]) == [3.0]
+    assert len(ring.deltas) == 1
+    assert ring.stats()["keys"] == 1
+
+
+# registro de plantillas con lugar para 3
+@pytest.fixture
+def registry():
+    return server._TemplateRegistry(3)
+
+
+def test_registry_evicts_unused_and_reuses_slot(registry):
+    for q in (1, 2, 3):
+        registry.observe("a", q, 1, 1.0, 1)
+    # CLOCK: el primer barrido limpia los bits de uso y desaloja el slot 0
+    registry.observe("a", 4, 1, 1.0, 1)
+    assert len(registry) == 3
+    assert registry.evicted == 1
+    assert registry.get("a", 1) is None
+    assert registry.slot_of["a"][4] == 0
+    # 2 y 4 se usan: la manecilla salta los bits en 1 y desaloja a 3
+    registry.get("a", 2)
+    registry.observe("a", 5, 1, 1.0, 1)
+    assert registry.get("a", 3) is None
+    assert registry.get("a", 2) is not None
+    assert registry.get("a", 4) is not None
+    assert len(registry) == 3
+
+
+def test_registry_evicted_slot_starts_empty(registry):
+    for q in (1, 2, 3):
+        registry.observe("a", q, 10, 5.0, 2)
+    registry.intern("a", 4, "select 1")
+    entry = registry.get("a", 4)
+    assert entry["calls"] == 0
+    assert entry["seen_at"] is None
+
+
+def test_registry_separates_sources(registry):
+    registry.observe("a", 1, 5, 1.0, 1)
+    registry.observe("b", 1, 7, 2.0, 1)
+    assert registry.get("a", 1)["calls"] == 5
+    assert registry.get("b", 1)["calls"] == 7
+    registry.observe("a", 2, 1, 1.0, 1)
+    # desaloja a ("a", 1) y después a ("b", 1), el único queryid de "b": su dict se borra
+    registry.observe("a", 3, 1, 1.0, 1)
+    registry.observe("a", 4, 1, 1.0, 1)
+    assert registry.get("b", 1) is None
+    assert registry.get("a", 1) is None
+    assert "b" not in registry.slot_of
+
+
+def test_registry_empty_text_keeps_normalized(registry):
+    normalized = registry.intern("a", 1, "select * from t where id = 42")
+    assert normalized
+    assert registry.intern("a", 1, "") == normalized
+    assert registry.intern("a", 2, "") == ""
+    assert registry.get("a", 2) is None
+
+
+# reloj falso para el TTL de las sesiones del shim
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(server.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_session_map_expires_idle_shim_sessions(clock):
+    sessions = server._SessionMap(idle_ttl_s=60)
+    sessions["a"] = "dsn-a"
+    sessions["b"] = "dsn-b"
+    sessions["c"] = "dsn-c"
+    assert sessions.pop("c") == "dsn-c"
+    assert sessions.pop("c", "none") == "none"
+    clock[0] += 40
+    # leer renueva la sesión
+    assert sessions.get("a") == "dsn-a"
+    clock[0] += 30
+    assert sessions.get("b") is None
+    assert sessions.get("a") == "dsn-a"
+    clock[0] += 60
+    assert sessions.get("a", "none") == "none"
+    assert len(sessions) == 0
+
+
+def test_session_map_ttl_zero_never_expires(clock):
+    sessions = server._SessionMap(idle_ttl_s=0)
+    sessions["a"] = "dsn-a"
+    clock[0] += 10**6
+    assert sessions.get("a") == "dsn-a"
+
+
+def test_session_map_pop_and_mcp_sessions(clock):
+    class Session:
+        pass
+
+    sessions = server._SessionMap(idle_ttl_s=60)
+    mcp_session = Session()
+    sessions[mcp_session] = "dsn-mcp"
+    sessions["a"] = "dsn-a"
+    clock[0] += 120
+    # las sesiones MCP no vencen por TTL: se van con el objeto de sesión
+    assert sessions.get(mcp_session) == "dsn-mcp"
+    assert sessions.get("a") is None
+    assert sessions.pop(mcp_session) == "dsn-mcp"
+    assert len(sessions) == 0